@@ -1,6 +1,6 @@
 """
 Configuration package for the application
 """
-from .database_config import DatabaseConfig, db_config
+from .database_config import DatabaseConfig, get_db, init_db, close_db
 
-__all__ = ['DatabaseConfig', 'db_config']
\ No newline at end of file
+__all__ = ['DatabaseConfig', 'get_db', 'init_db', 'close_db']
\ No newline at end of file
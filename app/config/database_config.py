@@ -1,34 +1,114 @@
 """
 Database connection and configuration
 """
-import pymongo
-import urllib.parse
+from dotenv import load_dotenv
+from pymongo import AsyncMongoClient
+from typing import Dict, List, Optional
+import asyncio
 import os
 
+# Pick up settings from a local .env file when present
+load_dotenv()
+
 
 class DatabaseConfig:
     """Simple MongoDB database configuration"""
     
     def __init__(self):
-        # Get environment variables with defaults
-        username = os.getenv("MONGODB_USERNAME", "himanshubarnwal1126")
-        password = os.getenv("MONGODB_PASSWORD", "Hkb@8570890789")
-        cluster_url = os.getenv("MONGODB_CLUSTER", "cluster0.q0dysfk.mongodb.net")
+        # Connection settings come from the environment; there are no built-in credentials
+        connection_string = os.getenv("MONGODB_URI")
+        if not connection_string:
+            raise RuntimeError("MONGODB_URI environment variable is not set")
         database_name = os.getenv("MONGODB_DATABASE", "property_database")
         
-        # Create connection string
-        encoded_password = urllib.parse.quote_plus(password)
-        connection_string = f"mongodb+srv://{username}:{encoded_password}@{cluster_url}/"
+        # One async client per process shares its pool across all in-flight requests;
+        # size it per deployment so workers x max pool stays under the cluster's connection limit
+        self.min_pool_size = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+        self.max_pool_size = int(os.getenv("MONGODB_MAX_POOL_SIZE", "20"))
+        self.wait_queue_timeout_ms = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
         
-        # Initialize MongoDB client and collections
-        self.client = pymongo.MongoClient(connection_string, serverSelectionTimeoutMS=10000)
+        # Initialize async MongoDB client and collections
+        self.client = AsyncMongoClient(
+            connection_string,
+            appname="agentmira-backend",
+            maxPoolSize=self.max_pool_size,
+            minPoolSize=self.min_pool_size,
+            waitQueueTimeoutMS=self.wait_queue_timeout_ms,
+            compressors="zlib",
+            serverSelectionTimeoutMS=5000,
+            retryReads=True
+        )
         self.database = self.client[database_name]
         
         # Collection references
         self.properties_list_collection = self.database["properties_list"]
         self.properties_info_collection = self.database["properties_info"]
         self.properties_images_collection = self.database["properties_images"]
+    
+    async def ping_database(self) -> bool:
+        """Check that the MongoDB deployment is reachable"""
+        await self.client.admin.command("ping")
+        return True
+    
+    async def get_collection_counts(self) -> Dict[str, int]:
+        """Count documents in each collection, issuing the queries concurrently"""
+        properties, info, images = await asyncio.gather(
+            self.properties_list_collection.count_documents({}),
+            self.properties_info_collection.count_documents({}),
+            self.properties_images_collection.count_documents({})
+        )
+        return {
+            "properties_list": properties,
+            "properties_info": info,
+            "properties_images": images
+        }
+    
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Create the indexes used by per-property lookups and searches (idempotent) and list them"""
+        await asyncio.gather(
+            self.properties_list_collection.create_index("id", unique=True),
+            self.properties_list_collection.create_index([("price", 1), ("location", 1)]),
+            self.properties_info_collection.create_index("id"),
+            self.properties_images_collection.create_index("id")
+        )
+        properties, info, images = await asyncio.gather(
+            self.properties_list_collection.index_information(),
+            self.properties_info_collection.index_information(),
+            self.properties_images_collection.index_information()
+        )
+        return {
+            "properties_list": sorted(properties),
+            "properties_info": sorted(info),
+            "properties_images": sorted(images)
+        }
+    
+    async def close(self) -> None:
+        """Close the MongoDB client and its connection pool"""
+        await self.client.close()
+
+
+# Global database instance, created on application startup
+db_config: Optional[DatabaseConfig] = None
+
+
+def get_db() -> DatabaseConfig:
+    """Get the database instance created on application startup"""
+    if db_config is None:
+        raise RuntimeError("Database is not initialized; init_db() must run on startup")
+    return db_config
+
+
+async def init_db() -> DatabaseConfig:
+    """Create the database client inside the running event loop"""
+    global db_config
+    if db_config is None:
+        db_config = DatabaseConfig()
+    return db_config
 
 
-# Global database instance
-db_config = DatabaseConfig()
\ No newline at end of file
+async def close_db() -> None:
+    """Close the database client on shutdown"""
+    global db_config
+    if db_config is not None:
+        await db_config.close()
+        db_config = None
\ No newline at end of file
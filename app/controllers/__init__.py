@@ -6,11 +6,13 @@ from .prediction_controller import PredictionController
 from .recommendation_controller import RecommendationController
 from .compare_controller import CompareController
 from .search_controller import SearchController
+from .admin_controller import AdminController
 
 __all__ = [
     'PropertyController', 
     'PredictionController', 
     'RecommendationController',
     'CompareController',
-    'SearchController'
+    'SearchController',
+    'AdminController'
 ]
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Admin Controller - Handles health check and status HTTP requests
+"""
+from fastapi import APIRouter, Response
+from app.services.property_service import property_service
+from app.utils.cache_manager import get_shared_cache
+import orjson
+
+# Status payloads are cached briefly so frequent health probes don't hit MongoDB
+STATUS_CACHE_TTL_SECONDS = 5
+
+
+class AdminController:
+    """Controller for health check and status endpoints"""
+    
+    def __init__(self):
+        self.router = APIRouter(tags=["admin"])
+        self.property_service = property_service
+        self.cache = get_shared_cache()
+        self._setup_routes()
+    
+    async def _get_database_status(self):
+        """Get database status, served from cache while fresh"""
+        db_status = self.cache.get("db_status")
+        if db_status is None:
+            db_status = await self.property_service.get_database_status()
+            self.cache.set("db_status", db_status, ttl=STATUS_CACHE_TTL_SECONDS)
+        return db_status
+    
+    def _setup_routes(self):
+        """Setup all admin routes"""
+        
+        @self.router.get("/health")
+        async def health_check():
+            """Report API, database and cache health"""
+            # Cache the serialized body so probes skip JSON encoding as well
+            body = self.cache.get("health")
+            if body is None:
+                db_status = await self._get_database_status()
+                body = orjson.dumps({
+                    "status": "healthy" if db_status["status"] == "connected" else "degraded",
+                    "database": db_status,
+                    "cache": self.cache.get_stats()
+                })
+                self.cache.set("health", body, ttl=STATUS_CACHE_TTL_SECONDS)
+            return Response(content=body, media_type="application/json")
+        
+        @self.router.get("/database/status")
+        async def database_status():
+            """Report database connectivity and collection sizes"""
+            return await self._get_database_status()
+        
+        @self.router.get("/cache/stats")
+        async def cache_stats():
+            """Report cache performance metrics"""
+            return self.cache.get_stats()
+        
+        @self.router.delete("/cache")
+        async def purge_cache():
+            """Drop every cached entry so the next requests reload from MongoDB"""
+            self.cache.clear()
+            return {"status": "purged"}
+        
+        @self.router.delete("/cache/properties/{property_id}")
+        async def purge_property_cache(property_id: int):
+            """Drop the cached payload of one property after its listing has changed"""
+            self.cache.delete(("property", property_id))
+            return {"status": "purged", "property_id": property_id}
+    
+    def get_router(self) -> APIRouter:
+        """Get the FastAPI router for this controller"""
+        return self.router
\ No newline at end of file
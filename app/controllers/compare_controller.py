@@ -2,11 +2,11 @@
 Compare Controller - Handles property comparison HTTP requests
 """
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from app.services.compare_service import CompareService
+from app.services.compare_service import compare_service
+from app.models.property_models import APIModel
 
 
-class CompareRequest(BaseModel):
+class CompareRequest(APIModel):
     """Request model for property comparison"""
     id1: int
     id2: int
@@ -17,7 +17,7 @@ class CompareController:
     
     def __init__(self):
         self.router = APIRouter(tags=["comparison"])
-        self.compare_service = CompareService()
+        self.compare_service = compare_service
         self._setup_routes()
     
     def _setup_routes(self):
@@ -28,12 +28,12 @@ class CompareController:
             """Compare two properties by their IDs"""
             try:
                 comparison_result = await self.compare_service.compare_properties(
-                    request.id1, 
+                    request.id1,
                     request.id2
                 )
-                return comparison_result
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            except LookupError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            return comparison_result
     
     def get_router(self) -> APIRouter:
         """Get the FastAPI router for this controller"""
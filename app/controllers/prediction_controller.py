@@ -1,8 +1,8 @@
 """
 Prediction Controller - Handles ML prediction HTTP requests
 """
-from fastapi import APIRouter, HTTPException
-from app.services.prediction_service import PredictionService
+from fastapi import APIRouter
+from app.services.prediction_service import prediction_service
 from app.models.property_models import PredictionRequest, PredictionResponse
 
 
@@ -11,7 +11,7 @@ class PredictionController:
     
     def __init__(self):
         self.router = APIRouter(tags=["prediction"])
-        self.prediction_service = PredictionService()
+        self.prediction_service = prediction_service
         self._setup_routes()
     
     def _setup_routes(self):
@@ -20,10 +20,7 @@ class PredictionController:
         @self.router.post("/predict", response_model=PredictionResponse)
         async def predict_price(request: PredictionRequest):
             """Predict property price using ML model"""
-            try:
-                return self.prediction_service.predict_price(request)
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            return self.prediction_service.predict_price(request)
     
     def get_router(self) -> APIRouter:
         """Get the FastAPI router for this controller"""
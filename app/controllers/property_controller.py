@@ -1,8 +1,15 @@
 """
 Property Controller - Handles property-related HTTP requests
 """
-from fastapi import APIRouter, HTTPException
-from app.services.property_service import PropertyService
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from app.services.property_service import PROPERTY_DETAIL_DEFAULTS, property_service
+from app.utils.cache_manager import get_shared_cache
+from app.utils.responses import ORJSONResponse
+import orjson
+
+# Assembled property payloads are cached briefly since listings change rarely
+PROPERTY_CACHE_TTL_SECONDS = 60
 
 
 class PropertyController:
@@ -10,79 +17,70 @@ class PropertyController:
     
     def __init__(self):
         self.router = APIRouter(tags=["properties"])  # Remove prefix since main.py handles routing
-        self.property_service = PropertyService()
+        self.property_service = property_service
+        self.cache = get_shared_cache()
         self._setup_routes()
     
     def _setup_routes(self):
         """Setup all property routes"""
         
-        @self.router.get("/properties")
+        @self.router.get("/properties", response_class=ORJSONResponse)
         async def get_all_properties():
             """Get all properties"""
-            try:
-                properties = await self.property_service.get_all_properties()
-                return {
-                    "status": "success",
-                    "total_properties": len(properties),
-                    "properties": properties
-                }
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            properties = await self.property_service.get_all_properties()
+            # Return the response directly so FastAPI skips jsonable_encoder
+            return ORJSONResponse({
+                "status": "success",
+                "total_properties": len(properties),
+                "properties": properties
+            })
+        
+        # Registered before /properties/{property_id} so "stream" is not parsed as an ID
+        @self.router.get("/properties/stream")
+        async def stream_all_properties():
+            """Stream all properties as newline-delimited JSON"""
+            async def ndjson_lines():
+                async for property_doc in self.property_service.iter_all_properties():
+                    yield orjson.dumps(property_doc) + b"\n"
+            return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
         
         @self.router.get("/properties/{property_id}")
         async def get_property_by_id(property_id: int):
             """Get a specific property by ID"""
-            try:
-                # Get base listing doc
-                property_doc = await self.property_service.get_property_by_id(property_id)
-                if not property_doc:
-                    raise HTTPException(status_code=404, detail="Property not found")
+            # Cached entries hold the serialized JSON body
+            cache_key = ("property", property_id)
+            cached_body = self.cache.get(cache_key)
+            if cached_body is not None:
+                return Response(content=cached_body, media_type="application/json")
+            
+            # Fetch listing joined with detailed info and images
+            property_doc = await self.property_service.get_property_full(property_id)
+            if not property_doc:
+                raise HTTPException(status_code=404, detail="Property not found")
 
-                # Get detailed info and images
-                property_info = await self.property_service.get_property_info(property_id)
-                images = await self.property_service.get_property_images(property_id)
+            property_info = property_doc['info'][0] if property_doc['info'] else None
+            images = property_doc['images']
 
-                # Build aggregated response
-                combined = {
-                    "_id": str(property_doc.get('_id')),
-                    "id": property_doc.get('id'),
-                    "title": property_doc.get('title'),
-                    "price": property_doc.get('price'),
-                    "location": property_doc.get('location'),
-                    "images": images or [],
-                }
+            # Build aggregated response
+            combined = {
+                "_id": str(property_doc.get('_id')),
+                "id": property_doc.get('id'),
+                "title": property_doc.get('title'),
+                "price": property_doc.get('price'),
+                "location": property_doc.get('location'),
+                "images": images or [],
+            }
 
-                # Add property details with defaults
-                details = {
-                    "bedrooms": 0, "bathrooms": 0, "size_sqft": 0, "amenities": [],
-                    "school_rating": 0, "commute_time": 0, "has_garage": False,
-                    "has_garden": False, "has_pool": False, "year_built": 0
-                }
-                
-                if property_info:
-                    details.update({
-                        "bedrooms": property_info.get('bedrooms', 0),
-                        "bathrooms": property_info.get('bathrooms', 0),
-                        "size_sqft": property_info.get('size_sqft', 0),
-                        "amenities": property_info.get('amenities', []),
-                        "school_rating": property_info.get('school_rating', 0),
-                        "commute_time": property_info.get('commute_time', 0),
-                        "has_garage": property_info.get('has_garage', False),
-                        "has_garden": property_info.get('has_garden', False),
-                        "has_pool": property_info.get('has_pool', False),
-                        "year_built": property_info.get('year_built', 0)
-                    })
-                
-                combined.update(details)
+            # Add property details, falling back to defaults for missing fields
+            info_get = (property_info or {}).get
+            combined.update({k: info_get(k, d) for k, d in PROPERTY_DETAIL_DEFAULTS.items()})
 
-                return {
-                    "status": "success",
-                    "property": combined
-                }
-            except HTTPException:
-                raise
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            body = orjson.dumps({
+                "status": "success",
+                "property": combined
+            })
+            self.cache.set(cache_key, body, ttl=PROPERTY_CACHE_TTL_SECONDS)
+            return Response(content=body, media_type="application/json")
     
     def get_router(self) -> APIRouter:
         """Get the FastAPI router for this controller"""
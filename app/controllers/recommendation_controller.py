@@ -1,8 +1,8 @@
 """
 Recommendation Controller - Handles recommendation HTTP requests
 """
-from fastapi import APIRouter, HTTPException
-from app.services.recommendation_service import RecommendationService
+from fastapi import APIRouter, Response
+from app.services.recommendation_service import recommendation_service
 from app.models.property_models import RecommendationRequest, RecommendationResponse
 
 
@@ -11,7 +11,7 @@ class RecommendationController:
     
     def __init__(self):
         self.router = APIRouter(tags=["recommendations"])
-        self.recommendation_service = RecommendationService()
+        self.recommendation_service = recommendation_service
         self._setup_routes()
     
     def _setup_routes(self):
@@ -20,11 +20,9 @@ class RecommendationController:
         @self.router.post("/recommend", response_model=RecommendationResponse)
         async def get_recommendations(request: RecommendationRequest):
             """Get property recommendations based on user criteria"""
-            try:
-                recommendations = await self.recommendation_service.get_recommendations(request)
-                return recommendations
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            # The service returns the serialized body, so FastAPI skips re-validating and encoding it
+            body = await self.recommendation_service.get_recommendations_json(request)
+            return Response(content=body, media_type="application/json")
     
     def get_router(self) -> APIRouter:
         """Get the FastAPI router for this controller"""
@@ -1,8 +1,8 @@
 """
 Search controller for property search operations
 """
-from fastapi import APIRouter, HTTPException
-from app.services.search_service import SearchService
+from fastapi import APIRouter
+from app.services.search_service import search_service
 from app.models.property_models import SearchRequest, SearchResponse
 
 
@@ -10,7 +10,7 @@ class SearchController:
     """Controller class for property search operations"""
     
     def __init__(self):
-        self.search_service = SearchService()
+        self.search_service = search_service
         self.router = APIRouter(tags=["search"])
         self._setup_routes()
     
@@ -20,10 +20,7 @@ class SearchController:
         @self.router.post("/findproperties", response_model=SearchResponse)
         async def find_properties(request: SearchRequest):
             """Find properties based on location, budget, and preferences"""
-            try:
-                return await self.search_service.find_properties(request)
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            return await self.search_service.find_properties(request)
     
     def get_router(self) -> APIRouter:
         """Return the configured router"""
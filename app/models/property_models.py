@@ -1,11 +1,16 @@
 """
 API models using Pydantic for request/response validation
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
 
-class PredictionRequest(BaseModel):
+class APIModel(BaseModel):
+    """Base model for API payloads: immutable once built, unknown fields dropped"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class PredictionRequest(APIModel):
     """Model for price prediction requests"""
     property_type: str = "SFH"  # Single Family Home, Condo, etc.
     lot_area: float = 5000      # Lot area in sqft
@@ -18,14 +23,14 @@ class PredictionRequest(BaseModel):
     school_rating: int = 7      # School district rating (1-10)
 
 
-class PredictionResponse(BaseModel):
+class PredictionResponse(APIModel):
     """Model for price prediction responses"""
     status: str
     predicted_price: float
     input_data: dict
 
 
-class RecommendationRequest(BaseModel):
+class RecommendationRequest(APIModel):
     """Model for property recommendation requests"""
     user_budget: int
     user_min_bedrooms: int
@@ -34,7 +39,7 @@ class RecommendationRequest(BaseModel):
     preferred_amenities: Optional[List[str]] = None
 
 
-class RecommendationResponse(BaseModel):
+class RecommendationResponse(APIModel):
     """Model for property recommendation responses"""
     status: str
     total_properties: int
@@ -43,7 +48,7 @@ class RecommendationResponse(BaseModel):
     performance_metrics: Optional[dict] = None
 
 
-class SearchPreferences(BaseModel):
+class SearchPreferences(APIModel):
     """Model for search preferences"""
     bedrooms: Optional[int] = None
     bathrooms: Optional[int] = None
@@ -51,14 +56,14 @@ class SearchPreferences(BaseModel):
     amenities: Optional[List[str]] = None
 
 
-class SearchRequest(BaseModel):
+class SearchRequest(APIModel):
     """Model for property search requests"""
     location: str
     budget: int
     preferences: Optional[SearchPreferences] = None
 
 
-class SearchResponse(BaseModel):
+class SearchResponse(APIModel):
     """Model for property search responses"""
     status: str
     total_properties: int
@@ -1,10 +1,16 @@
 """
 Services package for business logic
 """
-from .property_service import PropertyService
-from .recommendation_service import RecommendationService
-from .prediction_service import PredictionService
-from .compare_service import CompareService
-from .search_service import SearchService
+# Shared instances are exported under shared_* names; re-exporting them under their module
+# names would shadow the submodules as package attributes
+from .property_service import PropertyService, property_service as shared_property_service
+from .recommendation_service import RecommendationService, recommendation_service as shared_recommendation_service
+from .prediction_service import PredictionService, prediction_service as shared_prediction_service
+from .compare_service import CompareService, compare_service as shared_compare_service
+from .search_service import SearchService, search_service as shared_search_service
 
-__all__ = ['PropertyService', 'RecommendationService', 'PredictionService', 'CompareService', 'SearchService']
\ No newline at end of file
+__all__ = [
+    'PropertyService', 'RecommendationService', 'PredictionService', 'CompareService', 'SearchService',
+    'shared_property_service', 'shared_recommendation_service', 'shared_prediction_service',
+    'shared_compare_service', 'shared_search_service'
+]
\ No newline at end of file
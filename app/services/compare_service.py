@@ -1,101 +1,182 @@
 """
 Compare service for handling property comparison operations
 """
-from typing import Dict, Any, Optional
-from app.config.database_config import db_config
+from typing import Dict, Any, List, Optional
+import asyncio
+from app.config.database_config import DatabaseConfig, get_db
+from app.services.property_service import PROPERTY_DETAIL_DEFAULTS
+from app.utils.cache_manager import get_shared_cache
+
+# Only return the listing and joined info fields a comparison actually uses
+COMPARISON_PROJECTION = {
+    "id": 1, "title": 1, "location": 1, "price": 1,
+    **{f"info.{k}": 1 for k in PROPERTY_DETAIL_DEFAULTS}
+}
+
+# Comparison data for a property is cached since the same IDs recur across requests
+COMPARISON_CACHE_TTL_SECONDS = 600
 
 
 class CompareService:
     """Service class for property comparison operations"""
     
     def __init__(self):
-        self.db = db_config
+        self.cache = get_shared_cache()
+        # In-flight loads, so concurrent misses for one ID share a single fetch
+        self._pending: Dict[int, asyncio.Task] = {}
+    
+    @property
+    def db(self) -> DatabaseConfig:
+        """Database instance, resolved at call time since it is created on startup"""
+        return get_db()
     
     async def get_property_comparison_data(self, property_id: int) -> Optional[Dict[str, Any]]:
-        """Retrieve property data optimized for comparison"""
-        try:
-            # Get basic property info
-            property_doc = self.db.properties_list_collection.find_one({"id": property_id})
+        """Retrieve property data optimized for comparison, served from cache while fresh"""
+        comparison_data = await self.get_comparison_data_many([property_id])
+        return comparison_data[property_id]
+    
+    async def get_comparison_data_many(self, property_ids: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Retrieve comparison data for several properties, fetching cache misses in one batch"""
+        results = {}
+        missing = []
+        for property_id in dict.fromkeys(property_ids):
+            comparison_data = self.cache.get(("comparison", property_id))
+            if comparison_data is None:
+                missing.append(property_id)
+            else:
+                results[property_id] = comparison_data
+        if not missing:
+            return results
+        
+        # Join loads already in flight and batch the remaining IDs into one new load
+        new_ids = [property_id for property_id in missing if property_id not in self._pending]
+        if new_ids:
+            task = asyncio.ensure_future(self._bulk_fetch(new_ids))
+            for property_id in new_ids:
+                self._pending[property_id] = task
+            task.add_done_callback(lambda done: self._clear_pending(new_ids, done))
+        tasks = {self._pending[property_id] for property_id in missing}
+        
+        # Shield so one cancelled caller doesn't cancel the load for the others
+        for loaded in await asyncio.gather(*(asyncio.shield(task) for task in tasks)):
+            self.cache.set_many(
+                ((("comparison", property_id), comparison_data)
+                 for property_id, comparison_data in loaded.items() if comparison_data is not None),
+                ttl=COMPARISON_CACHE_TTL_SECONDS
+            )
+            results.update(loaded)
+        return {property_id: results.get(property_id) for property_id in property_ids}
+    
+    def _clear_pending(self, property_ids: List[int], task: asyncio.Task) -> None:
+        """Forget a finished load for the IDs it covered"""
+        for property_id in property_ids:
+            if self._pending.get(property_id) is task:
+                del self._pending[property_id]
+    
+    async def _bulk_fetch(self, property_ids: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Load comparison data for several properties, joining their info server-side"""
+        pipeline = [
+            {"$match": {"id": {"$in": property_ids}}},
+            {"$lookup": {
+                "from": self.db.properties_info_collection.name,
+                "localField": "id",
+                "foreignField": "id",
+                "as": "info"
+            }},
+            {"$project": COMPARISON_PROJECTION}
+        ]
+        cursor = await self.db.properties_list_collection.aggregate(pipeline)
+        docs_by_id = {doc.get('id'): doc for doc in await cursor.to_list(length=None)}
+        
+        results = {}
+        for property_id in property_ids:
+            property_doc = docs_by_id.get(property_id)
             if not property_doc:
-                return None
+                results[property_id] = None
+                continue
             
-            # Get detailed property info (may use different key names across datasets)
-            property_info = self.db.properties_info_collection.find_one({"id": property_id})
-
             # Start with basic comparison fields from properties_list
             comparison_data = {
                 "_id": str(property_doc.get('_id')),
                 "id": property_doc.get('id'),
                 "title": property_doc.get('title', 'Unknown Property'),
                 "location": property_doc.get('location', 'Unknown Location'),
-                "price": property_doc.get('price', 0),
-                "bedrooms": property_info.get('bedrooms', 0) if property_info else 0,
-                "bathrooms": property_info.get('bathrooms', 0) if property_info else 0,
-                "size_sqft": property_info.get('size_sqft', 0) if property_info else 0,
-                "amenities": property_info.get('amenities', []) if property_info else [],
-                "school_rating": property_info.get('school_rating', 0) if property_info else 0,
-                "commute_time": property_info.get('commute_time', 0) if property_info else 0,
-                "has_garage": property_info.get('has_garage', False) if property_info else False,
-                "has_garden": property_info.get('has_garden', False) if property_info else False,
-                "has_pool": property_info.get('has_pool', False) if property_info else False,
-                "year_built": property_info.get('year_built', 0) if property_info else 0
+                "price": property_doc.get('price', 0)
             }
-
-            return comparison_data
-        except Exception as e:
-            raise Exception(f"Error retrieving property comparison data for {property_id}: {str(e)}")
+            
+            # Add detail fields, falling back to defaults for missing ones
+            info_get = (property_doc['info'][0] if property_doc.get('info') else {}).get
+            comparison_data.update({k: info_get(k, d) for k, d in PROPERTY_DETAIL_DEFAULTS.items()})
+            results[property_id] = comparison_data
+        
+        return results
     
     async def compare_properties(self, id1: int, id2: int) -> Dict[str, Any]:
         """Compare two properties and return detailed comparison"""
-        try:
-            # Get both properties
-            property1 = await self.get_property_comparison_data(id1)
-            property2 = await self.get_property_comparison_data(id2)
-            
-            if not property1:
-                raise Exception(f"Property with ID {id1} not found")
-            if not property2:
-                raise Exception(f"Property with ID {id2} not found")
+        # (A, B) and (B, A) share one cache entry keyed by the sorted pair
+        low_id, high_id = (id1, id2) if id1 <= id2 else (id2, id1)
+        cache_key = ("comparison_pair", low_id, high_id)
+        comparison = self.cache.get(cache_key)
+        if comparison is None:
+            # Get both properties in one batch
+            properties = await self.get_comparison_data_many([id1, id2])
             
-            # Calculate differences
-            price_difference = property2.get('price', 0) - property1.get('price', 0)
-            bedrooms_difference = property2.get('bedrooms', 0) - property1.get('bedrooms', 0)
-            bathrooms_difference = property2.get('bathrooms', 0) - property1.get('bathrooms', 0)
-            size_difference = property2.get('size_sqft', 0) - property1.get('size_sqft', 0)
+            if not properties[id1]:
+                raise LookupError(f"Property with ID {id1} not found")
+            if not properties[id2]:
+                raise LookupError(f"Property with ID {id2} not found")
             
-            # Determine comparison notes
-            comparison_notes = {
-                "larger_property": id1 if property1.get('size_sqft', 0) > property2.get('size_sqft', 0) else id2,
-                "more_expensive": id1 if property1.get('price', 0) > property2.get('price', 0) else id2,
-                "more_bedrooms": id1 if property1.get('bedrooms', 0) > property2.get('bedrooms', 0) else id2,
-                "more_bathrooms": id1 if property1.get('bathrooms', 0) > property2.get('bathrooms', 0) else id2
-            }
-            
-            # Handle equal cases
-            if property1.get('size_sqft', 0) == property2.get('size_sqft', 0):
-                comparison_notes["larger_property"] = "equal"
-            if property1.get('price', 0) == property2.get('price', 0):
-                comparison_notes["more_expensive"] = "equal"
-            if property1.get('bedrooms', 0) == property2.get('bedrooms', 0):
-                comparison_notes["more_bedrooms"] = "equal"
-            if property1.get('bathrooms', 0) == property2.get('bathrooms', 0):
-                comparison_notes["more_bathrooms"] = "equal"
-            
-            # Create comparison summary
-            comparison_summary = {
-                "price_difference": price_difference,
-                "bedrooms_difference": bedrooms_difference,
-                "bathrooms_difference": bathrooms_difference,
-                "size_difference": size_difference,
-                "comparison_notes": comparison_notes
-            }
-            
-            return {
-                "status": "success",
-                "property1": property1,
-                "property2": property2,
-                "comparison_summary": comparison_summary
-            }
-            
-        except Exception as e:
-            raise Exception(f"Error comparing properties: {str(e)}")
\ No newline at end of file
+            comparison = self._build_comparison(low_id, properties[low_id], high_id, properties[high_id])
+            self.cache.set(cache_key, comparison, ttl=COMPARISON_CACHE_TTL_SECONDS)
+        
+        if id1 == low_id:
+            return comparison
+        # Reversed pair: rebuild the summary from the cached properties in swapped order
+        return self._build_comparison(id1, comparison["property2"], id2, comparison["property1"])
+    
+    def _build_comparison(self, id1: int, property1: Dict[str, Any],
+                          id2: int, property2: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the comparison payload for two properties in the given order"""
+        # Calculate differences
+        price_difference = property2.get('price', 0) - property1.get('price', 0)
+        bedrooms_difference = property2.get('bedrooms', 0) - property1.get('bedrooms', 0)
+        bathrooms_difference = property2.get('bathrooms', 0) - property1.get('bathrooms', 0)
+        size_difference = property2.get('size_sqft', 0) - property1.get('size_sqft', 0)
+        
+        # Determine comparison notes
+        comparison_notes = {
+            "larger_property": id1 if property1.get('size_sqft', 0) > property2.get('size_sqft', 0) else id2,
+            "more_expensive": id1 if property1.get('price', 0) > property2.get('price', 0) else id2,
+            "more_bedrooms": id1 if property1.get('bedrooms', 0) > property2.get('bedrooms', 0) else id2,
+            "more_bathrooms": id1 if property1.get('bathrooms', 0) > property2.get('bathrooms', 0) else id2
+        }
+        
+        # Handle equal cases
+        if property1.get('size_sqft', 0) == property2.get('size_sqft', 0):
+            comparison_notes["larger_property"] = "equal"
+        if property1.get('price', 0) == property2.get('price', 0):
+            comparison_notes["more_expensive"] = "equal"
+        if property1.get('bedrooms', 0) == property2.get('bedrooms', 0):
+            comparison_notes["more_bedrooms"] = "equal"
+        if property1.get('bathrooms', 0) == property2.get('bathrooms', 0):
+            comparison_notes["more_bathrooms"] = "equal"
+        
+        # Create comparison summary
+        comparison_summary = {
+            "price_difference": price_difference,
+            "bedrooms_difference": bedrooms_difference,
+            "bathrooms_difference": bathrooms_difference,
+            "size_difference": size_difference,
+            "comparison_notes": comparison_notes
+        }
+        
+        return {
+            "status": "success",
+            "property1": property1,
+            "property2": property2,
+            "comparison_summary": comparison_summary
+        }
+
+
+# Shared service instance
+compare_service = CompareService()
\ No newline at end of file
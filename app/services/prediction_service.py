@@ -1,7 +1,7 @@
 """
 Prediction service for handling ML model operations
 """
-from typing import Dict, Any
+from typing import List
 from app.utils.model_handler import model_handler
 from app.models.property_models import PredictionRequest, PredictionResponse
 
@@ -14,40 +14,29 @@ class PredictionService:
     
     def predict_price(self, request_data: PredictionRequest) -> PredictionResponse:
         """Predict property price using ML model"""
-        try:
-            # Convert request to model input format
-            model_input = self._prepare_model_input(request_data)
-            
-            # Get prediction from model
-            if not self.model_handler.is_loaded:
-                raise Exception("ML model is not loaded")
-            
-            prediction = self.model_handler.predict(model_input)
-            predicted_price = float(prediction[0]) if isinstance(prediction, list) else float(prediction)
-            
-            return PredictionResponse(
+        return self.predict_prices([request_data])[0]
+    
+    def predict_prices(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        """Predict prices for several requests with a single model call"""
+        # Request fields map one-to-one onto model features, so one dict per request serves
+        # as both the model input and the echoed input data
+        input_rows = [request_data.model_dump() for request_data in requests]
+        # Get predictions from model
+        if not self.model_handler.is_loaded:
+            raise RuntimeError("ML model is not loaded")
+        
+        predictions = self.model_handler.predict_batch(input_rows)
+        
+        # Built from already-validated requests, so skip re-validating (and copying) input_data
+        return [
+            PredictionResponse.model_construct(
                 status="success",
-                predicted_price=predicted_price,
-                input_data=request_data.dict()
-            )
-            
-        except Exception as e:
-            return PredictionResponse(
-                status="error",
-                predicted_price=0.0,
-                input_data=request_data.dict()
+                predicted_price=float(predicted_price),
+                input_data=input_data
             )
-    
-    def _prepare_model_input(self, request: PredictionRequest) -> Dict[str, Any]:
-        """Prepare input data for the ML model"""
-        return {
-            'property_type': request.property_type,
-            'lot_area': request.lot_area,
-            'building_area': request.building_area,
-            'bedrooms': request.bedrooms,
-            'bathrooms': request.bathrooms,
-            'year_built': request.year_built,
-            'has_pool': request.has_pool,
-            'has_garage': request.has_garage,
-            'school_rating': request.school_rating
-        }
\ No newline at end of file
+            for predicted_price, input_data in zip(predictions, input_rows)
+        ]
+
+
+# Shared service instance
+prediction_service = PredictionService()
\ No newline at end of file
@@ -1,106 +1,166 @@
 """
 Property service for handling basic property operations
 """
-from typing import List, Dict, Any, Optional
-from app.config.database_config import db_config
+from typing import AsyncIterator, List, Dict, Any, Optional
+from app.config.database_config import DatabaseConfig, get_db
+
+# Detail fields reported for a single property (detail and comparison endpoints), with the
+# defaults used when info is missing: zero/empty, so unknown values don't look like real data
+PROPERTY_DETAIL_DEFAULTS = {
+    "bedrooms": 0, "bathrooms": 0, "size_sqft": 0, "amenities": (),
+    "school_rating": 0, "commute_time": 0, "has_garage": False,
+    "has_garden": False, "has_pool": False, "year_built": 0
+}
+
+# Defaults for catalog details (used for recommendations) of properties without (complete)
+# info documents; these are typical mid-range values rather than zeros, so a listing with
+# missing info is scored as an average home instead of being ranked last
+CATALOG_DETAIL_DEFAULTS = {
+    "bedrooms": 2, "bathrooms": 1, "size_sqft": 1200, "amenities": (),
+    "school_rating": 5, "commute_time": 30, "has_garage": False,
+    "has_garden": False, "has_pool": False, "year_built": 2010
+}
+
+# Listing fields used for basic_info in property details
+BASIC_INFO_PROJECTION = {"id": 1, "title": 1, "price": 1, "location": 1}
+
+# Whole-catalog reads fetch large batches so they need few getMore round-trips
+CATALOG_BATCH_SIZE = 1000
 
 
 class PropertyService:
     """Service class for property-related operations"""
     
-    def __init__(self):
-        self.db = db_config
+    @property
+    def db(self) -> DatabaseConfig:
+        """Database instance, resolved at call time since it is created on startup"""
+        return get_db()
     
     async def get_all_properties(self) -> List[Dict[str, Any]]:
         """Retrieve all properties from the database"""
-        try:
-            properties = []
-            # Use synchronous iteration since we're using pymongo (not motor)
-            for property_doc in self.db.properties_list_collection.find():
-                # Convert ObjectId to string for JSON serialization
-                property_doc['_id'] = str(property_doc['_id'])
-                properties.append(property_doc)
-            return properties
-        except Exception as e:
-            raise Exception(f"Error retrieving properties: {str(e)}")
+        cursor = self.db.properties_list_collection.find(batch_size=CATALOG_BATCH_SIZE)
+        properties = await cursor.to_list(length=None)
+        for property_doc in properties:
+            # Convert ObjectId to string for JSON serialization
+            property_doc['_id'] = str(property_doc['_id'])
+        return properties
+    
+    async def iter_all_properties(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield properties one at a time as the cursor delivers them"""
+        cursor = self.db.properties_list_collection.find(batch_size=CATALOG_BATCH_SIZE)
+        async for property_doc in cursor:
+            property_doc['_id'] = str(property_doc['_id'])
+            yield property_doc
     
     async def get_property_by_id(self, property_id: int) -> Optional[Dict[str, Any]]:
         """Retrieve a specific property by ID"""
-        try:
-            # Use synchronous call since we're using pymongo (not motor)
-            property_doc = self.db.properties_list_collection.find_one({"id": property_id})
-            if property_doc:
-                property_doc['_id'] = str(property_doc['_id'])
-            return property_doc
-        except Exception as e:
-            raise Exception(f"Error retrieving property {property_id}: {str(e)}")
+        property_doc = await self.db.properties_list_collection.find_one({"id": property_id})
+        if property_doc:
+            property_doc['_id'] = str(property_doc['_id'])
+        return property_doc
     
     async def get_property_info(self, property_id: int) -> Optional[Dict[str, Any]]:
         """Retrieve detailed property information"""
-        try:
-            # Use synchronous call since we're using pymongo (not motor)
-            property_info = self.db.properties_info_collection.find_one({"id": property_id})
-            if property_info:
-                property_info['_id'] = str(property_info['_id'])
-            return property_info
-        except Exception as e:
-            raise Exception(f"Error retrieving property info for {property_id}: {str(e)}")
+        property_info = await self.db.properties_info_collection.find_one({"id": property_id})
+        if property_info:
+            property_info['_id'] = str(property_info['_id'])
+        return property_info
     
     async def get_property_images(self, property_id: int) -> List[Dict[str, Any]]:
         """Retrieve property images"""
-        try:
-            images = []
-            # Use synchronous iteration since we're using pymongo (not motor)
-            for image_doc in self.db.properties_images_collection.find({"id": property_id}):
-                image_doc['_id'] = str(image_doc['_id'])
-                images.append(image_doc)
-            return images
-        except Exception as e:
-            raise Exception(f"Error retrieving images for property {property_id}: {str(e)}")
+        images = []
+        async for image_doc in self.db.properties_images_collection.find({"id": property_id}):
+            image_doc['_id'] = str(image_doc['_id'])
+            images.append(image_doc)
+        return images
+    
+    async def get_property_full(self, property_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieve a property joined with its detailed info and images in one round-trip"""
+        pipeline = [
+            {"$match": {"id": property_id}},
+            {"$limit": 1},
+            {"$lookup": {
+                "from": self.db.properties_info_collection.name,
+                "localField": "id",
+                "foreignField": "id",
+                "as": "info"
+            }},
+            {"$lookup": {
+                "from": self.db.properties_images_collection.name,
+                "localField": "id",
+                "foreignField": "id",
+                "as": "images"
+            }}
+        ]
+        cursor = await self.db.properties_list_collection.aggregate(pipeline)
+        results = await cursor.to_list(length=1)
+        if not results:
+            return None
+        
+        property_doc = results[0]
+        property_doc['_id'] = str(property_doc['_id'])
+        for image_doc in property_doc['images']:
+            image_doc['_id'] = str(image_doc['_id'])
+        return property_doc
     
     async def get_all_property_details(self) -> List[Dict[str, Any]]:
         """Retrieve all properties with their detailed information"""
-        try:
-            properties_with_details = []
+        properties_with_details = []
+        
+        # Get all basic property info, then the detailed info for all of them in one query
+        property_docs = await self.db.properties_list_collection.find(
+            {}, BASIC_INFO_PROJECTION, batch_size=CATALOG_BATCH_SIZE
+        ).to_list(length=None)
+        property_ids = [property_doc.get('id') for property_doc in property_docs]
+        info_by_id = {}
+        info_cursor = self.db.properties_info_collection.find(
+            {"id": {"$in": property_ids}}, {"_id": 0}, batch_size=CATALOG_BATCH_SIZE
+        )
+        async for property_info in info_cursor:
+            # Keep the first info document per property, as find_one would
+            info_by_id.setdefault(property_info.get('id'), property_info)
+        
+        for property_doc in property_docs:
+            property_id = property_doc.get('id')
+            
+            # Get detailed info (optional)
+            property_info = info_by_id.get(property_id)
+            
+            # Always include the property, even if detailed info is missing
+            basic_info = {
+                "_id": str(property_doc['_id']),
+                "id": property_doc.get('id'),
+                "title": property_doc.get('title'),
+                "price": property_doc.get('price'),
+                "location": property_doc.get('location')
+            }
             
-            # Get all basic property info using synchronous iteration
-            for property_doc in self.db.properties_list_collection.find():
-                property_id = property_doc.get('id')
-                
-                # Get detailed info (optional)
-                property_info = await self.get_property_info(property_id)
-                
-                # Always include the property, even if detailed info is missing
-                basic_info = {
-                    "_id": str(property_doc['_id']),
-                    "id": property_doc.get('id'),
-                    "title": property_doc.get('title'),
-                    "price": property_doc.get('price'),
-                    "location": property_doc.get('location')
-                }
-                
-                # Use detailed info if available, otherwise use defaults
-                details = {}
-                if property_info:
-                    details = {k: v for k, v in property_info.items() if k != '_id'}
-                
-                # Set defaults for missing fields
-                defaults = {
-                    "id": property_id, "bedrooms": 2, "bathrooms": 1, "size_sqft": 1200,
-                    "amenities": [], "school_rating": 5, "commute_time": 30,
-                    "has_garage": False, "has_garden": False, "has_pool": False, "year_built": 2010
-                }
-                
-                for key, default_value in defaults.items():
-                    if key not in details:
-                        details[key] = default_value
-                
-                combined_property = {
-                    "basic_info": basic_info,
-                    "details": details
-                }
-                properties_with_details.append(combined_property)
+            # Use detailed info if available (a fresh per-request document), otherwise use defaults
+            details = property_info or {}
             
-            return properties_with_details
+            # Set defaults for missing fields
+            details.setdefault("id", property_id)
+            for key, default_value in CATALOG_DETAIL_DEFAULTS.items():
+                if key not in details:
+                    details[key] = default_value
+            
+            combined_property = {
+                "basic_info": basic_info,
+                "details": details
+            }
+            properties_with_details.append(combined_property)
+        
+        return properties_with_details
+    
+    async def get_database_status(self) -> Dict[str, Any]:
+        """Check database connectivity and report collection sizes"""
+        try:
+            await self.db.ping_database()
+            collections = await self.db.get_collection_counts()
+            return {"status": "connected", "collections": collections}
         except Exception as e:
-            raise Exception(f"Error retrieving all property details: {str(e)}")
\ No newline at end of file
+            return {"status": "disconnected", "error": str(e)}
+
+
+# Shared service instance
+property_service = PropertyService()
\ No newline at end of file
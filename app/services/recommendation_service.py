@@ -1,54 +1,106 @@
 """
 Recommendation service for property recommendations
 """
-from typing import Dict, Any, List
-from app.services.property_service import PropertyService
+import asyncio
+import heapq
+from datetime import date
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+import orjson
+from app.services.property_service import property_service
 from app.models.property_models import RecommendationRequest, RecommendationResponse
+from app.utils.cache_manager import get_shared_cache
+
+# The property catalog changes slowly, so scoring reuses a recent copy
+CATALOG_CACHE_TTL_SECONDS = 60
+
+# Score components that depend only on the property, precomputed once per cached catalog
+STATIC_SCORE_NAMES = ("school_rating_score", "commute_score", "property_age_score", "amenities_score")
+
+
+class ScoringCatalog(NamedTuple):
+    """Property catalog laid out as parallel columns, one row per property"""
+    version: int
+    properties: List[Dict[str, Any]]
+    prices: List[float]
+    bedrooms: List[int]
+    commute_times: List[int]
+    school_ratings: List[int]
+    static_scores: List[Tuple[float, float, float, float]]
+    rounded_scores: List[Dict[str, float]]
 
 
 class RecommendationService:
     """Service class for property recommendation operations"""
     
     def __init__(self):
-        self.property_service = PropertyService()
+        self.property_service = property_service
+        self.cache = get_shared_cache()
+        # Bumped on every catalog build so cached rankings never outlive the catalog they came from
+        self._catalog_version = 0
+        # In-flight catalog build, so concurrent cache misses share a single load
+        self._pending_build: Optional[asyncio.Task] = None
+    
+    async def _get_scoring_catalog(self) -> ScoringCatalog:
+        """Get the property catalog as parallel columns with request-independent scores, served from cache while fresh"""
+        catalog = self.cache.get("recommendation_catalog")
+        if catalog is None:
+            # Concurrent misses join one in-flight build instead of each scanning the catalog
+            if self._pending_build is None:
+                self._pending_build = asyncio.ensure_future(self._build_scoring_catalog())
+                self._pending_build.add_done_callback(self._clear_pending_build)
+            # Shield so one cancelled caller doesn't cancel the build for the others
+            catalog = await asyncio.shield(self._pending_build)
+        return catalog
+    
+    def _clear_pending_build(self, task: asyncio.Task) -> None:
+        """Forget a finished catalog build"""
+        if self._pending_build is task:
+            self._pending_build = None
+    
+    async def _build_scoring_catalog(self) -> ScoringCatalog:
+        """Load the property catalog, precompute its static scores and cache it"""
+        properties = await self.property_service.get_all_property_details()
+        # Ages are measured from the current year, resolved once per catalog build
+        current_year = date.today().year
+        static_scores = [self._calculate_static_scores(p["details"], current_year) for p in properties]
+        # One list per field, so batch scoring walks flat columns instead of nested dicts
+        self._catalog_version += 1
+        catalog = ScoringCatalog(
+            version=self._catalog_version,
+            properties=properties,
+            prices=[p["basic_info"].get("price", 0) for p in properties],
+            bedrooms=[p["details"].get("bedrooms", 0) for p in properties],
+            commute_times=[p["details"].get("commute_time", 30) for p in properties],
+            school_ratings=[p["details"].get("school_rating", 5) for p in properties],
+            static_scores=static_scores,
+            rounded_scores=[
+                dict(zip(STATIC_SCORE_NAMES, (round(score, 2) for score in scores)))
+                for scores in static_scores
+            ]
+        )
+        self.cache.set("recommendation_catalog", catalog, ttl=CATALOG_CACHE_TTL_SECONDS)
+        return catalog
     
     async def get_recommendations(self, request: RecommendationRequest) -> RecommendationResponse:
         """Get property recommendations based on user criteria"""
-        try:
-            # Get all properties with details
-            all_properties = await self.property_service.get_all_property_details()
-            
-            if not all_properties:
-                return RecommendationResponse(
-                    status="error",
-                    total_properties=0,
-                    recommended_properties=[],
-                    cache_info=None,
-                    performance_metrics=None
-                )
-            
-            # Calculate scores for all properties (simplified - no caching complexity)
-            all_scored_properties = []
-            for property_data in all_properties:
-                scores = await self._calculate_property_score(property_data, request)
-                property_with_score = property_data.copy()
-                property_with_score["scores"] = scores
-                all_scored_properties.append(property_with_score)
-            
-            # Filter and sort properties
-            recommended_properties = self._filter_and_sort_properties(
-                all_scored_properties, request
-            )
-            
-            return RecommendationResponse(
-                status="success",
-                total_properties=len(recommended_properties),
-                recommended_properties=recommended_properties,
-                cache_info=None,
-                performance_metrics=None
-            )
-            
-        except Exception as e:
+        # Get all properties with details and precomputed scores
+        catalog = await self._get_scoring_catalog()
+        return self._build_response(catalog, request)
+    
+    async def get_recommendations_json(self, request: RecommendationRequest) -> bytes:
+        """Get recommendations as a serialized JSON body, reused for identical criteria"""
+        # The catalog is fetched once, so the cached body is always ranked on the build its key names
+        catalog = await self._get_scoring_catalog()
+        cache_key = ("recommendations_json", *self._criteria_key(catalog, request))
+        body = self.cache.get(cache_key)
+        if body is None:
+            body = orjson.dumps(self._build_response(catalog, request).model_dump())
+            self.cache.set(cache_key, body, ttl=CATALOG_CACHE_TTL_SECONDS)
+        return body
+    
+    def _build_response(self, catalog: ScoringCatalog, request: RecommendationRequest) -> RecommendationResponse:
+        """Rank the given catalog against the request and wrap the result in a response"""
+        if not catalog.properties:
             return RecommendationResponse(
                 status="error",
                 total_properties=0,
@@ -56,28 +108,56 @@ class RecommendationService:
                 cache_info=None,
                 performance_metrics=None
             )
+        
+        recommended_properties = self._rank_properties(catalog, request)
+        
+        # Built from trusted internal data, so skip per-item validation
+        return RecommendationResponse.model_construct(
+            status="success",
+            total_properties=len(recommended_properties),
+            recommended_properties=recommended_properties,
+            cache_info=None,
+            performance_metrics=None
+        )
+    
+    def _criteria_key(self, catalog: ScoringCatalog, request: RecommendationRequest) -> Tuple[Any, ...]:
+        """Cache key part for the catalog build and the request fields that affect ranking"""
+        return (
+            catalog.version, request.user_budget, request.user_min_bedrooms,
+            request.user_max_commute, request.user_min_school_rating
+        )
     
-    async def _calculate_property_score(self, property_data: Dict[str, Any], request: RecommendationRequest) -> Dict[str, float]:
-        """Calculate weighted score for a property"""
-        basic_info = property_data["basic_info"]
-        details = property_data["details"]
+    def _rank_properties(self, catalog: ScoringCatalog, request: RecommendationRequest) -> List[Dict[str, Any]]:
+        """Score the catalog against the request and return the top properties with their scores"""
+        # Filter first: only properties within budget and the optional commute/school limits
+        # can be recommended, so only they are scored
+        candidates = self._filter_candidates(catalog, request)
+        if not candidates:
+            return []
         
-        # 1. Price Match Score (30%)
-        property_price = basic_info.get("price", 0)
-        if property_price <= request.user_budget:
-            price_match_score = 100.0
-        else:
-            # Penalize properties over budget
-            over_budget_ratio = property_price / request.user_budget
-            price_match_score = max(0, 100 - (over_budget_ratio - 1) * 100)
+        # Score the remaining properties in one batch
+        price_match_scores, bedroom_scores, total_scores = self._calculate_scores_batch(catalog, candidates, request)
         
-        # 2. Bedroom Score (20%)
-        property_bedrooms = details.get("bedrooms", 0)
-        if property_bedrooms >= request.user_min_bedrooms:
-            bedroom_score = 100.0
-        else:
-            bedroom_score = 0.0  # Property doesn't meet minimum requirements
+        # Rank on the reported (rounded) totals, then build score breakdowns only for the returned properties
+        rounded_totals = [round(total_score, 2) for total_score in total_scores]
+        properties = catalog.properties
+        rounded_scores = catalog.rounded_scores
+        recommended_properties = []
+        for position in self._sort_properties(rounded_totals):
+            i = candidates[position]
+            property_with_score = properties[i].copy()
+            property_with_score["scores"] = {
+                "price_match_score": round(price_match_scores[position], 2),
+                "bedroom_score": round(bedroom_scores[position], 2),
+                **rounded_scores[i],
+                "total_score": rounded_totals[position]
+            }
+            recommended_properties.append(property_with_score)
         
+        return recommended_properties
+    
+    def _calculate_static_scores(self, details: Dict[str, Any], current_year: int) -> Tuple[float, float, float, float]:
+        """Calculate the score components that depend only on the property"""
         # 3. School Rating Score (15%)
         school_rating = details.get("school_rating", 5)
         school_rating_score = (school_rating / 10) * 100
@@ -93,7 +173,6 @@ class RecommendationService:
         
         # 5. Property Age Score (10%)
         year_built = details.get("year_built", 2000)
-        current_year = 2024
         property_age = current_year - year_built
         if property_age <= 5:
             property_age_score = 100.0
@@ -107,40 +186,66 @@ class RecommendationService:
         has_garage = details.get("has_garage", False)
         has_garden = details.get("has_garden", False)
         
-        amenity_count = sum([has_pool, has_garage, has_garden])
+        amenity_count = (1 if has_pool else 0) + (1 if has_garage else 0) + (1 if has_garden else 0)
         amenities_score = (amenity_count / 3) * 100
         
-        # Calculate weighted total score
-        total_score = (
-            0.3 * price_match_score +
-            0.2 * bedroom_score +
-            0.15 * school_rating_score +
-            0.15 * commute_score +
-            0.1 * property_age_score +
-            0.1 * amenities_score
-        )
-        
-        return {
-            "price_match_score": round(price_match_score, 2),
-            "bedroom_score": round(bedroom_score, 2),
-            "school_rating_score": round(school_rating_score, 2),
-            "commute_score": round(commute_score, 2),
-            "property_age_score": round(property_age_score, 2),
-            "amenities_score": round(amenities_score, 2),
-            "total_score": round(total_score, 2)
-        }
+        return school_rating_score, commute_score, property_age_score, amenities_score
     
-    def _filter_and_sort_properties(self, properties: List[Dict[str, Any]], request: RecommendationRequest) -> List[Dict[str, Any]]:
-        """Filter properties within budget and sort by score"""
-        # Filter: Only include properties within budget
-        within_budget = []
-        for prop in properties:
-            property_price = prop["basic_info"].get("price", 0)
-            if property_price <= request.user_budget:
-                within_budget.append(prop)
+    def _calculate_scores_batch(self, catalog: ScoringCatalog, indices: List[int],
+                                request: RecommendationRequest) -> Tuple[List[float], List[float], List[float]]:
+        """Calculate price, bedroom and weighted total score columns for the catalog rows at indices"""
+        budget = request.user_budget
+        min_bedrooms = request.user_min_bedrooms
+        prices = catalog.prices
+        bedrooms = catalog.bedrooms
+        static_scores = catalog.static_scores
+        
+        # 1. Price Match Score (30%), penalizing properties over budget
+        price_match_scores = [
+            100.0 if prices[i] <= budget else max(0, 100 - (prices[i] / budget - 1) * 100)
+            for i in indices
+        ]
+        
+        # 2. Bedroom Score (20%), zero when the property doesn't meet minimum requirements
+        bedroom_scores = [100.0 if bedrooms[i] >= min_bedrooms else 0.0 for i in indices]
+        
+        # Calculate weighted total scores, with the precomputed static components
+        total_scores = []
+        for price_match_score, bedroom_score, i in zip(price_match_scores, bedroom_scores, indices):
+            school_rating_score, commute_score, property_age_score, amenities_score = static_scores[i]
+            total_scores.append(
+                0.3 * price_match_score +
+                0.2 * bedroom_score +
+                0.15 * school_rating_score +
+                0.15 * commute_score +
+                0.1 * property_age_score +
+                0.1 * amenities_score
+            )
         
-        # Sort by total score (highest first)
-        sorted_properties = sorted(within_budget, key=lambda x: x["scores"]["total_score"], reverse=True)
+        return price_match_scores, bedroom_scores, total_scores
+    
+    def _filter_candidates(self, catalog: ScoringCatalog, request: RecommendationRequest) -> List[int]:
+        """Return the catalog indices of properties within budget and any commute/school limits"""
+        budget = request.user_budget
+        max_commute = request.user_max_commute
+        min_school_rating = request.user_min_school_rating
+        prices = catalog.prices
+        if max_commute is None and min_school_rating is None:
+            return [i for i, property_price in enumerate(prices) if property_price <= budget]
         
-        # Return top 3 recommendations within budget
-        return sorted_properties[:3]
\ No newline at end of file
+        commute_times = catalog.commute_times
+        school_ratings = catalog.school_ratings
+        return [
+            i for i, property_price in enumerate(prices)
+            if property_price <= budget
+            and (max_commute is None or commute_times[i] <= max_commute)
+            and (min_school_rating is None or school_ratings[i] >= min_school_rating)
+        ]
+    
+    def _sort_properties(self, total_scores: List[float]) -> List[int]:
+        """Return the positions of the top 3 total scores"""
+        # Partial selection instead of a full sort; ties keep catalog order, as sorted() did
+        return heapq.nlargest(3, range(len(total_scores)), key=total_scores.__getitem__)
+
+# Shared service instance
+recommendation_service = RecommendationService()
\ No newline at end of file
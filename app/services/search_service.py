@@ -1,95 +1,112 @@
 """
 Search service for handling property search operations
 """
-from typing import List, Dict, Any, Optional
-from app.config.database_config import db_config
-from app.models.property_models import SearchRequest, SearchResponse
+import re
+from typing import Dict, Any, List
+from app.config.database_config import DatabaseConfig, get_db
+from app.models.property_models import SearchPreferences, SearchRequest, SearchResponse
+from app.services.property_service import CATALOG_BATCH_SIZE
+from app.utils.cache_manager import get_shared_cache
+
+# Identical searches repeat often while users adjust filters, and listings change rarely
+SEARCH_CACHE_TTL_SECONDS = 60
 
 
 class SearchService:
     """Service class for search-related operations"""
     
     def __init__(self):
-        self.db = db_config
+        self.cache = get_shared_cache()
+    
+    @property
+    def db(self) -> DatabaseConfig:
+        """Database instance, resolved at call time since it is created on startup"""
+        return get_db()
     
     async def find_properties(self, request: SearchRequest) -> SearchResponse:
         """Find properties based on location, budget, and preferences"""
-        try:
-            matching_properties = []
-            
-            # Get all properties from properties_list collection
-            for property_doc in self.db.properties_list_collection.find():
-                property_doc['_id'] = str(property_doc['_id'])
-                
-                # Check location match (case-insensitive)
-                property_location = property_doc.get('location', '').lower()
-                if request.location.lower() not in property_location:
-                    continue
-                
-                # Check budget constraint
-                property_price = property_doc.get('price', 0)
-                if property_price > request.budget:
-                    continue
-                
-                # If no preferences, add the property (location and budget match)
-                if not request.preferences:
-                    matching_properties.append(property_doc)
-                    continue
-                
-                # Check detailed preferences from properties_info collection
-                property_id = property_doc.get('id')
-                property_info = self.db.properties_info_collection.find_one({"id": property_id})
-                
-                if not property_info:
-                    # If no detailed info but basic criteria match, still include
-                    matching_properties.append(property_doc)
-                    continue
-                
-                # Check preferences against property_info
-                if self._matches_preferences(property_info, request.preferences):
-                    matching_properties.append(property_doc)
-            
-            return SearchResponse(
-                status="success",
-                total_properties=len(matching_properties),
-                properties=matching_properties
-            )
-            
-        except Exception as e:
-            return SearchResponse(
-                status="error",
-                total_properties=0,
-                properties=[]
+        # Location matching is case-insensitive and amenities are an unordered, case-insensitive
+        # set, so both are normalized to let equivalent searches share an entry
+        preferences = request.preferences
+        cache_key = (
+            "search", request.location.lower(), request.budget,
+            None if preferences is None else (
+                preferences.bedrooms, preferences.bathrooms, preferences.min_size_sqft,
+                frozenset(amenity.lower() for amenity in preferences.amenities or ())
             )
+        )
+        matching_properties = self.cache.get(cache_key)
+        if matching_properties is None:
+            matching_properties = await self._query_properties(request)
+            self.cache.set(cache_key, matching_properties, ttl=SEARCH_CACHE_TTL_SECONDS)
+        
+        # Built from trusted internal data, so skip per-item validation
+        return SearchResponse.model_construct(
+            status="success",
+            total_properties=len(matching_properties),
+            properties=matching_properties
+        )
     
-    def _matches_preferences(self, property_info: Dict[str, Any], preferences) -> bool:
-        """Check if property matches all user preferences"""
-        # Check bedrooms (property should have >= requested bedrooms)
-        if preferences.bedrooms is not None:
-            property_bedrooms = property_info.get('bedrooms', 0)
-            if property_bedrooms < preferences.bedrooms:
-                return False
+    async def _query_properties(self, request: SearchRequest) -> List[Dict[str, Any]]:
+        """Query the properties matching location, budget, and preferences"""
+        # Let MongoDB apply the location (case-insensitive substring) and budget constraints,
+        # escaping the location so it is matched literally rather than as a pattern
+        query = {"price": {"$lte": request.budget}}
+        # A listing without a price counts as costing 0, so it is within any non-negative budget
+        if request.budget >= 0:
+            query = {"$or": [query, {"price": {"$exists": False}}]}
+        # An empty location matches every listing, so it adds no regex for the server to evaluate
+        if request.location:
+            query["location"] = {"$regex": re.escape(request.location), "$options": "i"}
         
-        # Check bathrooms (property should have >= requested bathrooms)
-        if preferences.bathrooms is not None:
-            property_bathrooms = property_info.get('bathrooms', 0)
-            if property_bathrooms < preferences.bathrooms:
-                return False
+        preference_filter = self._build_preference_filter(request.preferences) if request.preferences else None
+        if not preference_filter:
+            cursor = self.db.properties_list_collection.find(query, batch_size=CATALOG_BATCH_SIZE)
+        else:
+            # Join detailed info server-side and drop properties whose info document fails any
+            # preference; properties without detailed info still match on location and budget.
+            # Only the first info document counts, as with a single find_one per property
+            pipeline = [
+                {"$match": query},
+                {"$lookup": {
+                    "from": self.db.properties_info_collection.name,
+                    "localField": "id",
+                    "foreignField": "id",
+                    "as": "info"
+                }},
+                {"$addFields": {"info": {"$slice": ["$info", 1]}}},
+                {"$match": {"info": {"$not": {"$elemMatch": {"$nor": [preference_filter]}}}}},
+                {"$project": {"info": 0}}
+            ]
+            cursor = await self.db.properties_list_collection.aggregate(pipeline, batchSize=CATALOG_BATCH_SIZE)
+        matching_properties = await cursor.to_list(length=None)
         
-        # Check minimum size (property should be >= requested size)
-        if preferences.min_size_sqft is not None:
-            property_size = property_info.get('size_sqft', 0)
-            if property_size < preferences.min_size_sqft:
-                return False
+        # Convert ObjectId to string only for the properties actually returned
+        for property_doc in matching_properties:
+            property_doc['_id'] = str(property_doc['_id'])
         
-        # Check amenities (property should have ALL requested amenities)
-        if preferences.amenities:
-            property_amenities = property_info.get('amenities', [])
-            # Convert to lowercase for case-insensitive comparison
-            property_amenities_lower = [amenity.lower() for amenity in property_amenities]
-            
-            for required_amenity in preferences.amenities:
-                if required_amenity.lower() not in property_amenities_lower:
-                    return False
+        return matching_properties
+    
+    def _build_preference_filter(self, preferences: SearchPreferences) -> Dict[str, Any]:
+        """Build the properties_info query an info document must match to satisfy all preferences"""
+        preference_filter = {}
+        
+        # Bedrooms, bathrooms and size are minimums; a missing field only satisfies a minimum of 0 or less
+        for field, minimum in (("bedrooms", preferences.bedrooms),
+                               ("bathrooms", preferences.bathrooms),
+                               ("size_sqft", preferences.min_size_sqft)):
+            if minimum is not None and minimum > 0:
+                preference_filter[field] = {"$gte": minimum}
         
-        return True
\ No newline at end of file
+        # Property should have ALL requested amenities, compared case-insensitively
+        required_amenities = dict.fromkeys(amenity.lower() for amenity in preferences.amenities or ())
+        if required_amenities:
+            preference_filter["$and"] = [
+                {"amenities": {"$regex": f"^{re.escape(amenity)}$", "$options": "i"}}
+                for amenity in required_amenities
+            ]
+        
+        return preference_filter
+
+# Shared service instance
+search_service = SearchService()
\ No newline at end of file
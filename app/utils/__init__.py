@@ -1,7 +1,7 @@
 """
 Utilities package for helper functions and utilities
 """
-from .cache_manager import get_cache_instance
+from .cache_manager import get_cache_instance, get_shared_cache
 from .model_handler import model_handler
 
-__all__ = ['get_cache_instance', 'model_handler']
\ No newline at end of file
+__all__ = ['get_cache_instance', 'get_shared_cache', 'model_handler']
\ No newline at end of file
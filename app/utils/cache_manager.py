@@ -1,7 +1,87 @@
 """
-Simplified Cache Manager - Minimal implementation for compatibility
+Cache Manager - In-memory TTL cache plus the property score cache interface
 """
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Hashable, Tuple
+import os
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe in-memory cache with per-entry expiry and least-recently-used eviction"""
+    
+    def __init__(self, max_size: int = 1000, default_ttl: float = 60.0):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        # Ordered from least to most recently used
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        # A single dict read is atomic under the GIL, so hits don't contend for the lock
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                with self._lock:
+                    # Only drop the expired entry, not one another thread stored meanwhile
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+            self.misses += 1
+            return default
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            pass  # Removed by another thread since the lookup; the value read is still valid
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ttl seconds (defaults to the cache-wide TTL)"""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._insert(key, (expires_at, value))
+    
+    def set_many(self, items: Iterable[Tuple[Hashable, Any]], ttl: Optional[float] = None) -> None:
+        """Store several (key, value) pairs with the same ttl under one lock acquisition"""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            for key, value in items:
+                self._insert(key, (expires_at, value))
+    
+    def delete(self, key: Hashable) -> None:
+        """Remove a single entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size and hit statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "status": "enabled",
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0
+        }
+    
+    def _insert(self, key: Hashable, entry: Tuple[float, Any]) -> None:
+        """Store an entry as most recently used, evicting if full (caller holds the lock)"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        elif len(self._entries) >= self.max_size:
+            # Drop the least recently used entry; expired ones are removed lazily on lookup
+            self._entries.popitem(last=False)
+        self._entries[key] = entry
 
 
 class PropertyScoreCache:
@@ -32,4 +112,15 @@ class PropertyScoreCache:
 
 def get_cache_instance() -> PropertyScoreCache:
     """Get a minimal cache instance"""
-    return PropertyScoreCache()
\ No newline at end of file
+    return PropertyScoreCache()
+
+
+_shared_cache: Optional[TTLCache] = None
+
+
+def get_shared_cache() -> TTLCache:
+    """Get the process-wide TTL cache shared by controllers and services"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TTLCache(max_size=int(os.getenv("CACHE_MAX_SIZE", "1000")))
+    return _shared_cache
\ No newline at end of file
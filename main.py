@@ -1,13 +1,18 @@
 """
 Property Management API with MVC Architecture
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import sys
-import os
+from fastapi.middleware.gzip import GZipMiddleware
+from pymongo.errors import ServerSelectionTimeoutError
+import asyncio
+import logging
+import uuid
+import orjson
 
-# Add app directory to Python path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+from app.config.database_config import init_db, close_db
+from app.utils.responses import ORJSONResponse
 
 # Import MVC controllers
 from app.controllers.property_controller import PropertyController
@@ -15,6 +20,58 @@ from app.controllers.prediction_controller import PredictionController
 from app.controllers.recommendation_controller import RecommendationController
 from app.controllers.compare_controller import CompareController
 from app.controllers.search_controller import SearchController
+from app.controllers.admin_controller import AdminController
+
+logger = logging.getLogger(__name__)
+
+# The root payload never changes, so it is serialized once at import
+ROOT_BODY = orjson.dumps({
+    "message": "Property Management API",
+    "version": "2.0.0",
+    "docs": "/docs",
+    "endpoints": {
+        "properties": ["GET /properties", "GET /properties/stream", "GET /properties/{property_id}"],
+        "prediction": ["POST /predict"],
+        "recommendations": ["POST /recommend"],
+        "comparison": ["POST /comparebyid"],
+        "search": ["POST /findproperties"],
+        "admin": [
+            "GET /health", "GET /database/status", "GET /cache/stats",
+            "DELETE /cache", "DELETE /cache/properties/{property_id}"
+        ]
+    }
+})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database client on startup and close it on shutdown"""
+    db = await init_db()
+    print(f"🔌 MongoDB pool: min={db.min_pool_size}, max={db.max_pool_size}, "
+          f"wait timeout={db.wait_queue_timeout_ms}ms")
+    
+    # Independent startup checks run concurrently; failures are reported, not fatal
+    ping, counts, indexes = await asyncio.gather(
+        db.ping_database(),
+        db.get_collection_counts(),
+        db.ensure_indexes(),
+        return_exceptions=True
+    )
+    if isinstance(ping, Exception):
+        print(f"⚠️ Could not reach MongoDB: {ping}")
+    if isinstance(counts, Exception):
+        print(f"⚠️ Could not count documents: {counts}")
+    else:
+        print(f"📊 Collection counts: {counts}")
+    if isinstance(indexes, Exception):
+        print(f"⚠️ Could not ensure database indexes: {indexes}")
+    else:
+        print(f"📇 Database indexes: {indexes}")
+    
+    yield
+    
+    await close_db()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -22,9 +79,31 @@ app = FastAPI(
     description="Complete MVC architecture with ML predictions and smart recommendations",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+
+# Registered before CORS so it runs inside it, keeping CORS headers on these 500 responses
+@app.middleware("http")
+async def unhandled_error_middleware(request: Request, call_next):
+    """Log any unhandled error with its traceback and turn it into a generic 500 response"""
+    try:
+        return await call_next(request)
+    except Exception:
+        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        logger.exception(
+            "Unhandled error on %s %s [request_id=%s]",
+            request.method, request.url.path, request_id
+        )
+        return ORJSONResponse(
+            status_code=500,
+            content={"detail": "Internal server error"},
+            headers={"X-Request-ID": request_id}
+        )
+
+
 # Configure CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -34,12 +113,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (property lists, recommendations) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Initialize and register MVC controllers
 property_controller = PropertyController()
 prediction_controller = PredictionController()
 recommendation_controller = RecommendationController()
 compare_controller = CompareController()
 search_controller = SearchController()
+admin_controller = AdminController()
 
 # Register all controller routers
 app.include_router(property_controller.get_router())
@@ -47,6 +130,20 @@ app.include_router(prediction_controller.get_router())
 app.include_router(recommendation_controller.get_router())
 app.include_router(compare_controller.get_router())
 app.include_router(search_controller.get_router())
+app.include_router(admin_controller.get_router())
+
+
+@app.get("/")
+async def root():
+    """Describe the API and its endpoints"""
+    return Response(content=ROOT_BODY, media_type="application/json")
+
+
+@app.exception_handler(ServerSelectionTimeoutError)
+async def database_unavailable_handler(request: Request, exc: ServerSelectionTimeoutError):
+    """Report an unreachable database as a temporary outage"""
+    return ORJSONResponse(status_code=503, content={"detail": "Database unavailable"})
+
 
 if __name__ == "__main__":
     import uvicorn